@@ -2,35 +2,65 @@
 
 from __future__ import annotations
 
+import asyncio
+from datetime import datetime, timezone
 from pathlib import Path
+from typing import Any
 
-from fastapi import FastAPI, Request
-from fastapi.responses import HTMLResponse, JSONResponse, RedirectResponse
+import orjson
+from fastapi import FastAPI
+from fastapi.responses import HTMLResponse, RedirectResponse, Response
 from fastapi.templating import Jinja2Templates
+from jinja2 import Template
 
-from src.db import Database
+from src.db import STATUS_NAMES, Database
 
-app = FastAPI(title="Calci-Trade Dashboard")
+
+class ORJSONResponse(Response):
+    """JSON response serialized with orjson instead of the stdlib encoder."""
+
+    media_type = "application/json"
+
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(content)
+
+
+app = FastAPI(title="Calci-Trade Dashboard", default_response_class=ORJSONResponse)
 
 TEMPLATE_DIR = Path(__file__).parent / "templates"
 templates = Jinja2Templates(directory=str(TEMPLATE_DIR))
+templates.env.auto_reload = False
+
+
+def format_ts(ms: int, fmt: str = "%Y-%m-%dT%H:%M") -> str:
+    """Render an epoch-ms UTC timestamp from the database as text."""
+    return datetime.fromtimestamp(ms / 1000, timezone.utc).strftime(fmt)
+
+
+templates.env.filters["ts"] = format_ts
+templates.env.filters["status"] = STATUS_NAMES.get
 
 # Injected at startup by main.py
 db: Database | None = None
 shared_state: dict = {}
 
+# Compiled once in init_dashboard so requests never touch the loader
+_templates: dict[str, Template] = {}
+
 
 def init_dashboard(database: Database, state: dict) -> None:
     global db, shared_state
     db = database
     shared_state = state
+    for name in ("dashboard.html", "trades.html", "markets.html"):
+        _templates[name] = templates.env.get_template(name)
 
 
 @app.get("/", response_class=HTMLResponse)
-async def index(request: Request):
+async def index():
     assert db is not None
     stats = await db.get_trade_stats()
-    snapshots = await db.get_snapshots(limit=60)
+    history = await db.get_balance_history(limit=60)
     today_trades = await db.get_today_trades()
     open_trades = await db.get_open_trades()
     activity = await db.get_activity_log(limit=30)
@@ -41,11 +71,13 @@ async def index(request: Request):
     total_pnl = stats.get("total_pnl", 0) or 0
     win_rate = (wins / (wins + losses) * 100) if (wins + losses) > 0 else 0.0
 
-    snap_labels = [s["timestamp"][:16] for s in reversed(snapshots)]
-    snap_values = [s["balance"] / 100 for s in reversed(snapshots)]
+    snap_labels: list[str] = []
+    snap_values: list[float] = []
+    for ts, balance in history:
+        snap_labels.append(format_ts(ts))
+        snap_values.append(balance / 100)
 
-    return templates.TemplateResponse("dashboard.html", {
-        "request": request,
+    html = await asyncio.to_thread(_templates["dashboard.html"].render, {
         "balance": shared_state.get("balance", 0),
         "total_pnl": total_pnl,
         "win_rate": round(win_rate, 1),
@@ -59,28 +91,29 @@ async def index(request: Request):
         "paused": shared_state.get("paused", False),
         "activity": activity,
     })
+    return HTMLResponse(html)
 
 
 @app.get("/trades", response_class=HTMLResponse)
-async def trades_page(request: Request):
+async def trades_page():
     assert db is not None
     all_trades = await db.get_all_trades(limit=500)
-    return templates.TemplateResponse("trades.html", {
-        "request": request,
+    # Up to 500 rows: render off the event loop so activity polls keep flowing
+    html = await asyncio.to_thread(_templates["trades.html"].render, {
         "trades": all_trades,
     })
+    return HTMLResponse(html)
 
 
 @app.get("/markets", response_class=HTMLResponse)
-async def markets_page(request: Request):
+async def markets_page():
     assert db is not None
     recent_scans = await db.get_recent_scans(limit=10)
     opportunities = shared_state.get("opportunities", [])
-    return templates.TemplateResponse("markets.html", {
-        "request": request,
+    return HTMLResponse(_templates["markets.html"].render({
         "opportunities": opportunities,
         "recent_scans": recent_scans,
-    })
+    }))
 
 
 @app.post("/toggle-pause")
@@ -98,4 +131,4 @@ async def api_activity():
     """JSON endpoint for live activity feed polling."""
     assert db is not None
     activity = await db.get_activity_log(limit=30)
-    return JSONResponse(content={"activity": activity})
+    return ORJSONResponse({"activity": activity})
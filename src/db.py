@@ -2,8 +2,12 @@
 
 from __future__ import annotations
 
+import asyncio
 import logging
-from datetime import datetime
+import time
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from datetime import datetime, timezone
 from typing import Any
 
 import aiosqlite
@@ -12,6 +16,22 @@ logger = logging.getLogger(__name__)
 
 DB_PATH = "calci_trade.db"
 
+# trades.status values
+STATUS_OPEN = 0
+STATUS_SETTLED = 1
+STATUS_LOST = 2
+STATUS_NAMES = {STATUS_OPEN: "open", STATUS_SETTLED: "settled", STATUS_LOST: "lost"}
+
+MAINTENANCE_INTERVAL = 900  # seconds between WAL checkpoint / optimize runs
+
+_PRAGMAS = (
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA cache_size=-20000",  # ~20 MB page cache
+    "PRAGMA busy_timeout=5000",
+)
+
 _SCHEMA = """
 CREATE TABLE IF NOT EXISTS trades (
     id INTEGER PRIMARY KEY AUTOINCREMENT,
@@ -22,14 +42,14 @@ CREATE TABLE IF NOT EXISTS trades (
     quantity INTEGER NOT NULL,
     order_id TEXT NOT NULL DEFAULT '',
     client_order_id TEXT NOT NULL DEFAULT '',
-    timestamp TEXT NOT NULL,
-    status TEXT NOT NULL DEFAULT 'open',  -- open / settled / lost
+    timestamp INTEGER NOT NULL,  -- epoch ms (UTC)
+    status INTEGER NOT NULL DEFAULT 0,  -- 0 open / 1 settled / 2 lost
     pnl INTEGER DEFAULT 0        -- cents
 );
 
 CREATE TABLE IF NOT EXISTS portfolio_snapshots (
     id INTEGER PRIMARY KEY AUTOINCREMENT,
-    timestamp TEXT NOT NULL,
+    timestamp INTEGER NOT NULL,
     balance INTEGER NOT NULL,
     total_invested INTEGER NOT NULL DEFAULT 0,
     total_pnl INTEGER NOT NULL DEFAULT 0,
@@ -39,7 +59,7 @@ CREATE TABLE IF NOT EXISTS portfolio_snapshots (
 
 CREATE TABLE IF NOT EXISTS market_scans (
     id INTEGER PRIMARY KEY AUTOINCREMENT,
-    timestamp TEXT NOT NULL,
+    timestamp INTEGER NOT NULL,
     opportunities_found INTEGER NOT NULL DEFAULT 0,
     trades_placed INTEGER NOT NULL DEFAULT 0
 );
@@ -51,34 +71,214 @@ CREATE TABLE IF NOT EXISTS settings (
 
 CREATE TABLE IF NOT EXISTS activity_log (
     id INTEGER PRIMARY KEY AUTOINCREMENT,
-    timestamp TEXT NOT NULL,
+    timestamp INTEGER NOT NULL,
     level TEXT NOT NULL DEFAULT 'info',  -- info / success / warning / error
     message TEXT NOT NULL
 );
+
+CREATE INDEX IF NOT EXISTS idx_trades_status_ts ON trades(status, timestamp DESC);
+CREATE INDEX IF NOT EXISTS idx_trades_ts ON trades(timestamp);
+CREATE INDEX IF NOT EXISTS idx_trades_status_pnl ON trades(status, pnl);
+CREATE INDEX IF NOT EXISTS idx_activity_ts ON activity_log(timestamp DESC);
+CREATE INDEX IF NOT EXISTS idx_snapshots_ts ON portfolio_snapshots(timestamp DESC);
+"""
+
+# PRAGMA user_version written by connect(); bump it with each migration
+SCHEMA_VERSION = 1
+
+# Epoch ms from a pre-v1 TEXT timestamp (naive UTC ISO-8601). Rows already
+# written as epoch ms, as integers or digit strings, are kept as they are.
+_LEGACY_TS = """CASE
+    WHEN typeof(timestamp) = 'integer' THEN timestamp
+    WHEN timestamp NOT GLOB '*[^0-9]*' THEN CAST(timestamp AS INTEGER)
+    ELSE CAST(round((julianday(timestamp) - 2440587.5) * 86400000) AS INTEGER)
+END"""
+
+# STATUS_* code from a pre-v1 TEXT status name or digit string
+_LEGACY_STATUS = f"""CASE status
+    WHEN 'open' THEN {STATUS_OPEN}
+    WHEN 'settled' THEN {STATUS_SETTLED}
+    WHEN 'lost' THEN {STATUS_LOST}
+    ELSE CAST(status AS INTEGER)
+END"""
+
+# v0 -> v1: TEXT timestamps become epoch-ms INTEGERs and trade status names
+# become STATUS_* codes. The old tables are renamed aside, recreated from
+# _SCHEMA, then copied across and dropped. The indexes are dropped first so
+# they get rebuilt on the new tables.
+_MIGRATE_V1_PRE = """
+DROP INDEX IF EXISTS idx_trades_status_ts;
+DROP INDEX IF EXISTS idx_trades_ts;
+DROP INDEX IF EXISTS idx_trades_status_pnl;
+DROP INDEX IF EXISTS idx_activity_ts;
+DROP INDEX IF EXISTS idx_snapshots_ts;
+ALTER TABLE trades RENAME TO trades_v0;
+ALTER TABLE portfolio_snapshots RENAME TO portfolio_snapshots_v0;
+ALTER TABLE market_scans RENAME TO market_scans_v0;
+ALTER TABLE activity_log RENAME TO activity_log_v0;
 """
 
+_MIGRATE_V1_POST = f"""
+INSERT INTO trades
+   (id, market_ticker, event_ticker, side, price, quantity,
+    order_id, client_order_id, timestamp, status, pnl)
+   SELECT id, market_ticker, event_ticker, side, price, quantity,
+          order_id, client_order_id, {_LEGACY_TS}, {_LEGACY_STATUS}, pnl
+   FROM trades_v0;
+INSERT INTO portfolio_snapshots
+   (id, timestamp, balance, total_invested, total_pnl, win_count, loss_count)
+   SELECT id, {_LEGACY_TS}, balance, total_invested, total_pnl,
+          win_count, loss_count
+   FROM portfolio_snapshots_v0;
+INSERT INTO market_scans (id, timestamp, opportunities_found, trades_placed)
+   SELECT id, {_LEGACY_TS}, opportunities_found, trades_placed
+   FROM market_scans_v0;
+INSERT INTO activity_log (id, timestamp, level, message)
+   SELECT id, {_LEGACY_TS}, level, message FROM activity_log_v0;
+DROP TABLE trades_v0;
+DROP TABLE portfolio_snapshots_v0;
+DROP TABLE market_scans_v0;
+DROP TABLE activity_log_v0;
+"""
+
+_INSERT_TRADE_SQL = f"""INSERT INTO trades
+   (market_ticker, event_ticker, side, price, quantity,
+    order_id, client_order_id, timestamp, status)
+   VALUES (?, ?, ?, ?, ?, ?, ?, ?, {STATUS_OPEN})"""
+
+_UPDATE_TRADE_STATUS_SQL = "UPDATE trades SET status = ?, pnl = ? WHERE id = ?"
+
+_INSERT_SNAPSHOT_SQL = """INSERT INTO portfolio_snapshots
+   (timestamp, balance, total_invested, total_pnl, win_count, loss_count)
+   VALUES (?, ?, ?, ?, ?, ?)"""
+
+_INSERT_SCAN_SQL = (
+    "INSERT INTO market_scans (timestamp, opportunities_found, trades_placed) "
+    "VALUES (?, ?, ?)"
+)
+
+_SET_SETTING_SQL = "INSERT OR REPLACE INTO settings (key, value) VALUES (?, ?)"
+
+_INSERT_ACTIVITY_SQL = (
+    "INSERT INTO activity_log (timestamp, level, message) VALUES (?, ?, ?)"
+)
+
+
+def _now_ms() -> int:
+    return int(time.time() * 1000)
+
+
+def _today_bounds() -> tuple[int, int]:
+    """Return ``[start, end)`` epoch-ms bounds for the current UTC day."""
+    midnight = datetime.now(timezone.utc).replace(
+        hour=0, minute=0, second=0, microsecond=0
+    )
+    start = int(midnight.timestamp() * 1000)
+    return start, start + 86_400_000
+
 
 class Database:
     def __init__(self, path: str = DB_PATH) -> None:
         self._path = path
         self._db: aiosqlite.Connection | None = None
+        self._maintenance_task: asyncio.Task | None = None
+        self._settings_cache: dict[str, str] = {}
+        # The trading loop, dashboard and maintenance task share one
+        # connection; writers hold this lock from first statement to commit.
+        self._write_lock = asyncio.Lock()
 
     async def connect(self) -> None:
-        self._db = await aiosqlite.connect(self._path)
+        self._db = await aiosqlite.connect(self._path, cached_statements=256)
         self._db.row_factory = aiosqlite.Row
-        await self._db.executescript(_SCHEMA)
-        await self._db.commit()
+        for pragma in _PRAGMAS:
+            await self._db.execute(pragma)
+        await self._migrate()
+        cur = await self._db.execute("SELECT key, value FROM settings")
+        self._settings_cache = {r["key"]: r["value"] for r in await cur.fetchall()}
+        self._maintenance_task = asyncio.create_task(self._maintenance_loop())
         logger.info("Database connected: %s", self._path)
 
+    async def _migrate(self) -> None:
+        """Create the schema, upgrading an older database in one transaction."""
+        cur = await self.db.execute("PRAGMA user_version")
+        (version,) = await cur.fetchone()
+        if version >= SCHEMA_VERSION:
+            await self.db.executescript(_SCHEMA)
+            return
+        cur = await self.db.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'trades'"
+        )
+        legacy = await cur.fetchone() is not None
+        script = _SCHEMA
+        if legacy:
+            script = _MIGRATE_V1_PRE + _SCHEMA + _MIGRATE_V1_POST
+        # executescript commits first and runs the script verbatim
+        try:
+            await self.db.executescript(
+                f"BEGIN;{script}PRAGMA user_version = {SCHEMA_VERSION};COMMIT;"
+            )
+        except Exception:
+            await self.db.rollback()
+            raise
+        if legacy:
+            logger.info("Database migrated to schema v%d", SCHEMA_VERSION)
+
     async def close(self) -> None:
+        if self._maintenance_task:
+            self._maintenance_task.cancel()
         if self._db:
             await self._db.close()
 
+    async def _maintenance_loop(self) -> None:
+        """Periodically truncate the WAL and refresh planner statistics."""
+        while True:
+            await asyncio.sleep(MAINTENANCE_INTERVAL)
+            try:
+                async with self._write_lock:
+                    await self.db.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+                    await self.db.execute("PRAGMA optimize")
+            except Exception:
+                logger.exception("Database maintenance failed")
+
     @property
     def db(self) -> aiosqlite.Connection:
         assert self._db is not None, "Database not connected"
         return self._db
 
+    @asynccontextmanager
+    async def transaction(self) -> AsyncIterator[None]:
+        """Group several writes into a single BEGIN IMMEDIATE ... COMMIT.
+
+        Writes inside the block must pass ``commit=False``; the lock is not
+        re-entrant.
+        """
+        async with self._write_lock:
+            await self.db.execute("BEGIN IMMEDIATE")
+            try:
+                yield
+            except BaseException:
+                await self.db.rollback()
+                raise
+            await self.db.commit()
+
+    @asynccontextmanager
+    async def _writing(self, commit: bool = True) -> AsyncIterator[None]:
+        """Run a standalone write under the lock and commit it.
+
+        With ``commit=False`` the caller is inside transaction(), which
+        already holds the lock and owns the commit.
+        """
+        if not commit:
+            yield
+            return
+        async with self._write_lock:
+            try:
+                yield
+            except BaseException:
+                await self.db.rollback()
+                raise
+            await self.db.commit()
+
     # ---- trades ----
 
     async def insert_trade(
@@ -90,52 +290,71 @@ class Database:
         quantity: int,
         order_id: str,
         client_order_id: str,
+        commit: bool = True,
+        ts: int | None = None,
     ) -> int:
-        cur = await self.db.execute(
-            """INSERT INTO trades
-               (market_ticker, event_ticker, side, price, quantity,
-                order_id, client_order_id, timestamp, status)
-               VALUES (?, ?, ?, ?, ?, ?, ?, ?, 'open')""",
-            (
-                market_ticker,
-                event_ticker,
-                side,
-                price,
-                quantity,
-                order_id,
-                client_order_id,
-                datetime.utcnow().isoformat(),
-            ),
-        )
-        await self.db.commit()
+        async with self._writing(commit):
+            cur = await self.db.execute(
+                _INSERT_TRADE_SQL,
+                (
+                    market_ticker,
+                    event_ticker,
+                    side,
+                    price,
+                    quantity,
+                    order_id,
+                    client_order_id,
+                    ts if ts is not None else _now_ms(),
+                ),
+            )
         return cur.lastrowid  # type: ignore[return-value]
 
+    async def insert_trades_many(
+        self, rows: list[tuple], ts: int | None = None
+    ) -> None:
+        """Insert many trades with one prepared statement and one commit.
+
+        Each row is ``(market_ticker, event_ticker, side, price, quantity,
+        order_id, client_order_id)``; all rows share one timestamp.
+        """
+        if not rows:
+            return
+        if ts is None:
+            ts = _now_ms()
+        async with self._writing():
+            await self.db.executemany(
+                _INSERT_TRADE_SQL, [(*row, ts) for row in rows]
+            )
+
     async def update_trade_status(
-        self, trade_id: int, status: str, pnl: int = 0
+        self, trade_id: int, status: int, pnl: int = 0
     ) -> None:
-        await self.db.execute(
-            "UPDATE trades SET status = ?, pnl = ? WHERE id = ?",
-            (status, pnl, trade_id),
-        )
-        await self.db.commit()
+        async with self._writing():
+            await self.db.execute(_UPDATE_TRADE_STATUS_SQL, (status, pnl, trade_id))
 
     async def get_open_trades(self) -> list[dict[str, Any]]:
         cur = await self.db.execute(
-            "SELECT * FROM trades WHERE status = 'open' ORDER BY timestamp DESC"
+            """SELECT id, market_ticker, side, price, quantity, timestamp
+               FROM trades WHERE status = ? ORDER BY timestamp DESC""",
+            (STATUS_OPEN,),
         )
         return [dict(r) for r in await cur.fetchall()]
 
     async def get_all_trades(self, limit: int = 200) -> list[dict[str, Any]]:
         cur = await self.db.execute(
-            "SELECT * FROM trades ORDER BY timestamp DESC LIMIT ?", (limit,)
+            """SELECT id, market_ticker, event_ticker, side, price, quantity,
+                      order_id, status, pnl, timestamp
+               FROM trades ORDER BY timestamp DESC LIMIT ?""",
+            (limit,),
         )
         return [dict(r) for r in await cur.fetchall()]
 
     async def get_today_trades(self) -> list[dict[str, Any]]:
-        today = datetime.utcnow().strftime("%Y-%m-%d")
         cur = await self.db.execute(
-            "SELECT * FROM trades WHERE timestamp LIKE ? ORDER BY timestamp DESC",
-            (f"{today}%",),
+            """SELECT market_ticker, side, price, quantity, status, pnl, timestamp
+               FROM trades WHERE timestamp >= ? AND timestamp < ?
+               ORDER BY timestamp DESC""",
+            _today_bounds(),
         )
         return [dict(r) for r in await cur.fetchall()]
 
@@ -143,10 +362,11 @@ class Database:
         cur = await self.db.execute(
             """SELECT
                  COUNT(*) as total,
-                 SUM(CASE WHEN status='settled' THEN 1 ELSE 0 END) as wins,
-                 SUM(CASE WHEN status='lost' THEN 1 ELSE 0 END) as losses,
+                 COUNT(*) FILTER (WHERE status = ?) as wins,
+                 COUNT(*) FILTER (WHERE status = ?) as losses,
                  SUM(pnl) as total_pnl
-               FROM trades"""
+               FROM trades""",
+            (STATUS_SETTLED, STATUS_LOST),
         )
         row = await cur.fetchone()
         return dict(row) if row else {"total": 0, "wins": 0, "losses": 0, "total_pnl": 0}
@@ -155,75 +375,99 @@ class Database:
 
     async def insert_snapshot(
         self, balance: int, total_invested: int, total_pnl: int,
-        win_count: int, loss_count: int,
+        win_count: int, loss_count: int, ts: int | None = None,
+        commit: bool = True,
     ) -> None:
-        await self.db.execute(
-            """INSERT INTO portfolio_snapshots
-               (timestamp, balance, total_invested, total_pnl, win_count, loss_count)
-               VALUES (?, ?, ?, ?, ?, ?)""",
-            (datetime.utcnow().isoformat(), balance, total_invested, total_pnl,
-             win_count, loss_count),
-        )
-        await self.db.commit()
-
-    async def get_snapshots(self, limit: int = 100) -> list[dict[str, Any]]:
+        async with self._writing(commit):
+            await self.db.execute(
+                _INSERT_SNAPSHOT_SQL,
+                (ts if ts is not None else _now_ms(), balance, total_invested,
+                 total_pnl, win_count, loss_count),
+            )
+
+    async def get_balance_history(self, limit: int = 100) -> list[tuple[int, int]]:
+        """Return the latest *limit* ``(timestamp, balance)`` pairs, oldest first."""
         cur = await self.db.execute(
-            "SELECT * FROM portfolio_snapshots ORDER BY timestamp DESC LIMIT ?",
+            """SELECT timestamp, balance FROM (
+                 SELECT timestamp, balance FROM portfolio_snapshots
+                 ORDER BY timestamp DESC LIMIT ?
+               ) ORDER BY timestamp""",
             (limit,),
         )
-        return [dict(r) for r in await cur.fetchall()]
+        return [tuple(r) for r in await cur.fetchall()]
 
     # ---- market scans ----
 
-    async def insert_scan(self, opportunities_found: int, trades_placed: int) -> None:
-        await self.db.execute(
-            "INSERT INTO market_scans (timestamp, opportunities_found, trades_placed) VALUES (?, ?, ?)",
-            (datetime.utcnow().isoformat(), opportunities_found, trades_placed),
-        )
-        await self.db.commit()
+    async def insert_scan(
+        self, opportunities_found: int, trades_placed: int,
+        ts: int | None = None, commit: bool = True,
+    ) -> None:
+        async with self._writing(commit):
+            await self.db.execute(
+                _INSERT_SCAN_SQL,
+                (ts if ts is not None else _now_ms(), opportunities_found,
+                 trades_placed),
+            )
 
     async def get_recent_scans(self, limit: int = 20) -> list[dict[str, Any]]:
         cur = await self.db.execute(
-            "SELECT * FROM market_scans ORDER BY timestamp DESC LIMIT ?", (limit,)
+            """SELECT timestamp, opportunities_found, trades_placed
+               FROM market_scans ORDER BY timestamp DESC LIMIT ?""",
+            (limit,),
         )
         return [dict(r) for r in await cur.fetchall()]
 
     # ---- settings ----
 
+    # Settings are loaded once in connect() and every write goes through
+    # set_setting, so the in-memory copy is always current.
+
     async def get_setting(self, key: str, default: str = "") -> str:
-        cur = await self.db.execute("SELECT value FROM settings WHERE key = ?", (key,))
-        row = await cur.fetchone()
-        return row["value"] if row else default
+        return self._settings_cache.get(key, default)
 
     async def set_setting(self, key: str, value: str) -> None:
-        await self.db.execute(
-            "INSERT OR REPLACE INTO settings (key, value) VALUES (?, ?)",
-            (key, value),
-        )
-        await self.db.commit()
+        async with self._writing():
+            await self.db.execute(_SET_SETTING_SQL, (key, value))
+        self._settings_cache[key] = value
 
     # ---- activity log ----
 
-    async def log_activity(self, message: str, level: str = "info") -> None:
-        await self.db.execute(
-            "INSERT INTO activity_log (timestamp, level, message) VALUES (?, ?, ?)",
-            (datetime.utcnow().isoformat(), level, message),
-        )
-        await self.db.commit()
+    async def log_activity(
+        self, message: str, level: str = "info", ts: int | None = None
+    ) -> None:
+        async with self._writing():
+            await self.db.execute(
+                _INSERT_ACTIVITY_SQL,
+                (ts if ts is not None else _now_ms(), level, message),
+            )
+
+    async def log_activity_many(
+        self, entries: list[tuple[int, str, str]], commit: bool = True,
+    ) -> None:
+        """Insert ``(timestamp, level, message)`` rows with one executemany.
+
+        Each row keeps its own epoch-ms timestamp, taken when it was buffered.
+        """
+        if not entries:
+            return
+        async with self._writing(commit):
+            await self.db.executemany(_INSERT_ACTIVITY_SQL, entries)
 
     async def get_activity_log(self, limit: int = 50) -> list[dict[str, Any]]:
         cur = await self.db.execute(
-            "SELECT * FROM activity_log ORDER BY timestamp DESC LIMIT ?", (limit,)
+            """SELECT timestamp, level, message
+               FROM activity_log ORDER BY timestamp DESC, id DESC LIMIT ?""",
+            (limit,),
         )
         return [dict(r) for r in await cur.fetchall()]
 
     # ---- daily P&L ----
 
     async def get_daily_pnl(self) -> int:
-        today = datetime.utcnow().strftime("%Y-%m-%d")
         cur = await self.db.execute(
-            "SELECT COALESCE(SUM(pnl), 0) as dpnl FROM trades WHERE timestamp LIKE ?",
-            (f"{today}%",),
+            """SELECT COALESCE(SUM(pnl), 0) as dpnl FROM trades
+               WHERE timestamp >= ? AND timestamp < ?""",
+            _today_bounds(),
         )
         row = await cur.fetchone()
         return row["dpnl"] if row else 0
@@ -3,7 +3,8 @@
 from __future__ import annotations
 
 import logging
-import uuid
+import time
+from secrets import token_hex
 from typing import Any
 
 import config
@@ -35,40 +36,55 @@ async def execute_signals(
         logger.info("Trading is paused via settings.")
         return 0
 
-    for signal in signals:
-        opp = signal.opportunity
-        client_order_id = uuid.uuid4().hex[:16]
+    ts = int(time.time() * 1000)  # one timestamp for the whole batch
+    rows: list[tuple] = []
+    # Record placed orders even if the loop is cancelled part-way, so a
+    # live order never goes missing from the local trades table
+    try:
+        for signal in signals:
+            opp = signal.opportunity
+            client_order_id = token_hex(8)
 
-        try:
-            result = await client.create_order(
-                ticker=opp.ticker,
-                action="buy",
-                side=opp.side,
-                count=signal.quantity,
-                price=opp.entry_price,
-                client_order_id=client_order_id,
-            )
+            try:
+                result = await client.create_order(
+                    ticker=opp.ticker,
+                    action="buy",
+                    side=opp.side,
+                    count=signal.quantity,
+                    price=opp.entry_price,
+                    client_order_id=client_order_id,
+                )
 
-            order_id = result.get("order", {}).get("order_id", "")
+                order_id = result.get("order", {}).get("order_id", "")
 
-            await db.insert_trade(
-                market_ticker=opp.ticker,
-                event_ticker=opp.event_ticker,
-                side=opp.side,
-                price=opp.entry_price,
-                quantity=signal.quantity,
-                order_id=order_id,
-                client_order_id=client_order_id,
-            )
+                rows.append((
+                    opp.ticker,
+                    opp.event_ticker,
+                    opp.side,
+                    opp.entry_price,
+                    signal.quantity,
+                    order_id,
+                    client_order_id,
+                ))
 
-            placed += 1
-            logger.info(
-                "Order placed: %s %s %s x%d @%dc (order_id=%s)",
-                opp.ticker, opp.side, "buy", signal.quantity,
-                opp.entry_price, order_id,
-            )
+                placed += 1
+                logger.info(
+                    "Order placed: %s %s %s x%d @%dc (order_id=%s)",
+                    opp.ticker, opp.side, "buy", signal.quantity,
+                    opp.entry_price, order_id,
+                )
 
+            except Exception:
+                logger.exception("Failed to place order for %s", opp.ticker)
+    finally:
+        try:
+            await db.insert_trades_many(rows, ts=ts)
         except Exception:
-            logger.exception("Failed to place order for %s", opp.ticker)
+            logger.exception("Batch trade insert failed; recording trades one by one")
+            for row in rows:
+                try:
+                    await db.insert_trade(*row, ts=ts)
+                except Exception:
+                    logger.exception("Failed to record trade for %s", row[0])
 
     return placed
@@ -2,8 +2,11 @@
 
 from __future__ import annotations
 
+import asyncio
 import base64
+import functools
 import logging
+import random
 import time
 from typing import Any
 from urllib.parse import urlparse
@@ -16,31 +19,73 @@ import config
 
 logger = logging.getLogger(__name__)
 
+# Connection failures are retried by the transport; read timeouts on GETs
+# are retried here because each attempt needs a freshly timestamped signature.
+_CONNECT_RETRIES = 2
+_TIMEOUT_RETRIES = 2
+# ConnectTimeout is left out: the transport already retries it
+_RETRYABLE_TIMEOUTS = (httpx.ReadTimeout, httpx.WriteTimeout, httpx.PoolTimeout)
+
+# GET signatures are reused for this long; query strings are not signed, so
+# every page of a paginated scan shares one signature.
+_SIGNATURE_REUSE_SECS = 1.0
+
+# In-flight cap for fan-out reads; keeps bursts under the Basic tier's
+# 20 reads/sec limit
+_MAX_CONCURRENT_READS = 10
+
+# Signing parameters are immutable; build them once rather than per request
+_PSS = padding.PSS(
+    mgf=padding.MGF1(hashes.SHA256()),
+    salt_length=padding.PSS.DIGEST_LENGTH,
+)
+_SHA256 = hashes.SHA256()
+
+
+@functools.lru_cache(maxsize=1)
+def _get_private_key(path: str) -> rsa.RSAPrivateKey:
+    """Load and parse the PEM key at *path*; cached per path."""
+    with open(path, "rb") as f:
+        key = serialization.load_pem_private_key(f.read(), password=None)
+    if not isinstance(key, rsa.RSAPrivateKey):
+        raise TypeError("Private key must be RSA")
+    return key
+
+
+@functools.lru_cache(maxsize=256)
+def _signed_suffix(method: str, path: str) -> bytes:
+    """Return the encoded ``{METHOD}{path}`` tail of the signed message."""
+    return f"{method.upper()}{path}".encode()
+
 
 class KalshiClient:
     """Thin async wrapper around the Kalshi v2 REST API."""
 
     def __init__(self) -> None:
         self._base_url: str = config.KALSHI_BASE_URL.rstrip("/")
+        self._base_path: str = urlparse(self._base_url).path.rstrip("/")
         self._api_key: str = config.KALSHI_API_KEY
-        self._private_key: rsa.RSAPrivateKey = self._load_private_key()
+        self._recent_signatures: dict[
+            tuple[str, str], tuple[float, dict[str, str]]
+        ] = {}
+        self._private_key: rsa.RSAPrivateKey = _get_private_key(
+            config.KALSHI_PRIVATE_KEY_PATH
+        )
+        transport = httpx.AsyncHTTPTransport(
+            retries=_CONNECT_RETRIES,
+            http2=True,
+            limits=httpx.Limits(max_connections=100, max_keepalive_connections=50),
+        )
         self._http: httpx.AsyncClient = httpx.AsyncClient(
             base_url=self._base_url,
             timeout=30.0,
+            transport=transport,
         )
 
     # ------------------------------------------------------------------
     # Lifecycle
     # ------------------------------------------------------------------
 
-    @staticmethod
-    def _load_private_key() -> rsa.RSAPrivateKey:
-        with open(config.KALSHI_PRIVATE_KEY_PATH, "rb") as f:
-            key = serialization.load_pem_private_key(f.read(), password=None)
-        if not isinstance(key, rsa.RSAPrivateKey):
-            raise TypeError("Private key must be RSA")
-        return key
-
     async def close(self) -> None:
         await self._http.aclose()
 
@@ -61,16 +106,9 @@ class KalshiClient:
         (e.g. ``/trade-api/v2/markets``).
         """
         timestamp_ms = str(int(time.time() * 1000))
-        message = f"{timestamp_ms}{method.upper()}{path}"
-
-        signature = self._private_key.sign(
-            message.encode(),
-            padding.PSS(
-                mgf=padding.MGF1(hashes.SHA256()),
-                salt_length=padding.PSS.DIGEST_LENGTH,
-            ),
-            hashes.SHA256(),
-        )
+        message = timestamp_ms.encode() + _signed_suffix(method, path)
+
+        signature = self._private_key.sign(message, _PSS, _SHA256)
 
         return {
             "KALSHI-ACCESS-KEY": self._api_key,
@@ -78,6 +116,24 @@ class KalshiClient:
             "KALSHI-ACCESS-SIGNATURE": base64.b64encode(signature).decode(),
         }
 
+    async def _auth_headers(self, method: str, path: str) -> dict[str, str]:
+        """Return auth headers, reusing a fresh GET signature when possible."""
+        key = (method, path)
+        now = time.monotonic()
+        if method == "GET":
+            cached = self._recent_signatures.get(key)
+            if cached and now - cached[0] < _SIGNATURE_REUSE_SECS:
+                return cached[1]
+
+        # RSA signing is CPU-bound; keep it off the event loop
+        headers = await asyncio.to_thread(self._sign_request, method, path)
+
+        if method == "GET":
+            if len(self._recent_signatures) > 256:
+                self._recent_signatures.clear()
+            self._recent_signatures[key] = (now, headers)
+        return headers
+
     # ------------------------------------------------------------------
     # Internal helpers
     # ------------------------------------------------------------------
@@ -90,20 +146,36 @@ class KalshiClient:
         params: dict[str, Any] | None = None,
         json: dict[str, Any] | None = None,
     ) -> Any:
-        url = f"{self._base_url}{endpoint}"
-        path = urlparse(url).path
-
-        headers = self._sign_request(method, path)
-
-        response = await self._http.request(
-            method,
-            endpoint,
-            params=params,
-            json=json,
-            headers=headers,
-        )
-        response.raise_for_status()
-        return response.json()
+        path = f"{self._base_path}{endpoint}"
+        # Only GETs are safe to resend after a timeout; an order may have landed
+        retries = _TIMEOUT_RETRIES if method == "GET" else 0
+        attempt = 0
+
+        while True:
+            headers = await self._auth_headers(method, path)
+
+            try:
+                response = await self._http.request(
+                    method,
+                    endpoint,
+                    params=params,
+                    json=json,
+                    headers=headers,
+                )
+            except _RETRYABLE_TIMEOUTS:
+                if attempt >= retries:
+                    raise
+                delay = min(2**attempt * 0.1, 2.0)
+                logger.warning(
+                    "Timeout on %s %s, retrying (attempt %d)",
+                    method, endpoint, attempt + 1,
+                )
+                await asyncio.sleep(random.uniform(delay / 2, delay))
+                attempt += 1
+                continue
+
+            response.raise_for_status()
+            return response.json()
 
     # ------------------------------------------------------------------
     # Public API methods
@@ -135,6 +207,16 @@ class KalshiClient:
         """Return the orderbook for *ticker*."""
         return await self._request("GET", f"/markets/{ticker}/orderbook")
 
+    async def get_orderbooks_many(self, tickers: list[str]) -> list[dict[str, Any]]:
+        """Fetch orderbooks for *tickers* concurrently, in input order."""
+        sem = asyncio.Semaphore(_MAX_CONCURRENT_READS)
+
+        async def fetch(ticker: str) -> dict[str, Any]:
+            async with sem:
+                return await self.get_orderbook(ticker)
+
+        return await asyncio.gather(*(fetch(t) for t in tickers))
+
     async def get_positions(self) -> dict[str, Any]:
         """Return open portfolio positions."""
         return await self._request("GET", "/portfolio/positions")
@@ -5,6 +5,7 @@ from __future__ import annotations
 import asyncio
 import logging
 import sys
+import time
 from contextlib import asynccontextmanager
 
 import uvicorn
@@ -40,11 +41,18 @@ state: dict = {
 }
 
 
+def _activity(message: str, level: str = "info") -> tuple[int, str, str]:
+    """Build a buffered activity-log row stamped with the current time."""
+    return int(time.time() * 1000), level, message
+
+
 async def trading_loop(client: KalshiClient, db: Database) -> None:
     """Run one scan-strategy-execute cycle every SCAN_INTERVAL seconds."""
     await db.log_activity("Bot started. Connecting to Kalshi API...", "info")
 
     while True:
+        # Activity for this cycle is buffered and written in one batch at the end
+        activity: list[tuple[int, str, str]] = []
         try:
             # Check pause
             paused = await db.get_setting("paused", "false")
@@ -54,78 +62,112 @@ async def trading_loop(client: KalshiClient, db: Database) -> None:
                 await asyncio.sleep(config.SCAN_INTERVAL)
                 continue
 
-            # Refresh balance
-            balance = await client.get_balance()
+            # Get open positions to avoid duplicates; held markets are left
+            # out of the scan's top-K so they can't crowd out new ones
+            open_trades = await db.get_open_trades()
+            open_tickers = frozenset(t["market_ticker"] for t in open_trades)
+
+            # Refresh balance and scan concurrently — independent API calls
+            activity.append(_activity("Scanning markets for opportunities...", "info"))
+            balance_task = asyncio.create_task(client.get_balance())
+            scan_task = asyncio.create_task(scan_markets(
+                client,
+                should_continue=lambda: not state["paused"],
+                exclude=open_tickers,
+            ))
+            tasks = (balance_task, scan_task)
+            try:
+                done, _ = await asyncio.wait(
+                    tasks, return_when=asyncio.FIRST_EXCEPTION
+                )
+            finally:
+                # Stop the sibling of a failed call, or both if we're cancelled
+                for task in tasks:
+                    task.cancel()
+                await asyncio.gather(*tasks, return_exceptions=True)
+            for task in done:
+                task.result()  # re-raise the first failure, if any
+            balance = balance_task.result()
+            scan = scan_task.result()
+            opportunities = scan.opportunities
             state["balance"] = balance
-            await db.log_activity(
-                f"Balance fetched: ${balance / 100:.2f}", "info"
-            )
-
-            # Scan
-            await db.log_activity("Scanning markets for opportunities...", "info")
-            opportunities = await scan_markets(client)
-            state["opportunities"] = [o.to_dict() for o in opportunities]
+            if state["paused"]:
+                # Paused from the dashboard mid-scan; drop this cycle's results
+                activity.append(_activity(
+                    "Scan interrupted — trading paused.", "warning"
+                ))
+                await db.log_activity_many(activity)
+                await asyncio.sleep(config.SCAN_INTERVAL)
+                continue
+            activity.append(_activity(f"Balance fetched: ${balance / 100:.2f}", "info"))
+            # The markets page reads Opportunity fields directly; no dict copies
+            state["opportunities"] = opportunities
 
+            found = str(scan.total) if scan.complete else f"at least {scan.total}"
             if opportunities:
                 top = opportunities[:5]
                 summary = ", ".join(
                     f"{o.ticker} ({o.side.upper()} @{o.entry_price}c, edge={o.edge:.1%})"
                     for o in top
                 )
-                await db.log_activity(
-                    f"Found {len(opportunities)} opportunities. Top: {summary}",
+                activity.append(_activity(
+                    f"Found {found} opportunities. Top: {summary}",
                     "success",
-                )
+                ))
+            elif scan.total:
+                activity.append(_activity(
+                    f"Found {found} opportunities, all in markets already held.",
+                    "info",
+                ))
             else:
-                await db.log_activity(
+                activity.append(_activity(
                     "Scan complete — no opportunities match thresholds.", "info"
-                )
-
-            # Get open positions to avoid duplicates
-            open_trades = await db.get_open_trades()
-            open_tickers = {t["market_ticker"] for t in open_trades}
+                ))
 
             # Strategy
             signals = score_opportunities(opportunities, balance, open_tickers)
             if signals:
-                await db.log_activity(
+                activity.append(_activity(
                     f"Strategy selected {len(signals)} trades to execute.", "info"
-                )
+                ))
 
             # Execute
             placed = await execute_signals(signals, client, db, balance)
             if placed:
-                await db.log_activity(
+                activity.append(_activity(
                     f"Placed {placed} orders successfully.", "success"
-                )
-
-            # Record scan
-            await db.insert_scan(
-                opportunities_found=len(opportunities),
-                trades_placed=placed,
-            )
+                ))
 
-            # Snapshot
-            stats = await db.get_trade_stats()
-            await db.insert_snapshot(
-                balance=balance,
-                total_invested=0,
-                total_pnl=stats.get("total_pnl", 0) or 0,
-                win_count=stats.get("wins", 0) or 0,
-                loss_count=stats.get("losses", 0) or 0,
-            )
-
-            await db.log_activity(
+            activity.append(_activity(
                 f"Cycle complete. Balance=${balance/100:.2f}, "
-                f"Opps={len(opportunities)}, Placed={placed}. "
+                f"Opps={scan.total}, Placed={placed}. "
                 f"Next scan in {config.SCAN_INTERVAL}s.",
                 "info",
-            )
+            ))
+
+            # Record scan, snapshot and the cycle's activity in one commit
+            stats = await db.get_trade_stats()
+            async with db.transaction():
+                await db.insert_scan(
+                    opportunities_found=scan.total,
+                    trades_placed=placed,
+                    commit=False,
+                )
+                await db.insert_snapshot(
+                    balance=balance,
+                    total_invested=0,
+                    total_pnl=stats.get("total_pnl", 0) or 0,
+                    win_count=stats.get("wins", 0) or 0,
+                    loss_count=stats.get("losses", 0) or 0,
+                    commit=False,
+                )
+                await db.log_activity_many(activity, commit=False)
 
         except Exception as exc:
             logger.exception("Error in trading loop")
+            activity.append(_activity(f"ERROR: {exc}", "error"))
             try:
-                await db.log_activity(f"ERROR: {exc}", "error")
+                await db.log_activity_many(activity)
             except Exception:
                 pass
 
@@ -159,6 +201,8 @@ def main() -> None:
         host="0.0.0.0",
         port=8080,
         log_level="info",
+        # uvloop has no Windows support
+        loop="asyncio" if sys.platform == "win32" else "uvloop",
     )
 
 
@@ -2,108 +2,213 @@
 
 from __future__ import annotations
 
+import asyncio
+import functools
+import heapq
 import logging
+from collections.abc import AsyncIterator, Callable
 from datetime import datetime, timedelta, timezone
-from typing import Any
+from typing import Any, NamedTuple
 
 import config
 from src.kalshi_client import KalshiClient
 
 logger = logging.getLogger(__name__)
 
+# Best edge _filter_page can produce: YES bid at 1c (longshot) or 99c
+# (favourite); 100c favourites are never taken
+_MAX_EDGE = 0.49
 
-class Opportunity:
+# Edge for each YES price in cents, or None where implied win rate < 90%
+_NO_EDGE: tuple[float | None, ...] = tuple(
+    round((100 - p) / 100.0 - 0.5, 4) if (100 - p) / 100.0 >= 0.90 else None
+    for p in range(101)
+)
+_YES_EDGE: tuple[float | None, ...] = tuple(
+    round(p / 100.0 - 0.5, 4) if p / 100.0 >= 0.90 else None
+    for p in range(101)
+)
+
+
+class Opportunity(NamedTuple):
     """A single trading opportunity detected by the scanner."""
 
-    __slots__ = (
-        "ticker", "event_ticker", "title", "yes_price", "no_price",
-        "side", "entry_price", "edge", "close_time",
-    )
+    ticker: str
+    event_ticker: str
+    title: str
+    yes_price: int
+    no_price: int
+    side: str
+    entry_price: int
+    edge: float
+    close_time: str
 
-    def __init__(
-        self,
-        ticker: str,
-        event_ticker: str,
-        title: str,
-        yes_price: int,
-        no_price: int,
-        side: str,
-        entry_price: int,
-        edge: float,
-        close_time: str,
-    ) -> None:
-        self.ticker = ticker
-        self.event_ticker = event_ticker
-        self.title = title
-        self.yes_price = yes_price
-        self.no_price = no_price
-        self.side = side
-        self.entry_price = entry_price
-        self.edge = edge
-        self.close_time = close_time
-
-    def to_dict(self) -> dict[str, Any]:
-        return {k: getattr(self, k) for k in self.__slots__}
-
-
-async def scan_markets(client: KalshiClient) -> list[Opportunity]:
-    """Fetch all open markets and return scored opportunities."""
-    opportunities: list[Opportunity] = []
-    cursor: str | None = None
-    cutoff = datetime.now(timezone.utc) + timedelta(days=config.MAX_EXPIRY_DAYS)
 
-    while True:
-        data = await client.get_markets(cursor=cursor, limit=1000, status="open")
-        markets = data.get("markets", [])
+class ScanResult(NamedTuple):
+    """Outcome of one scan_markets call."""
 
-        for m in markets:
-            # Filter: must have close_time within expiry window
-            close_time = m.get("close_time", "")
-            if not close_time:
-                continue
+    opportunities: list[Opportunity]  # best first, at most max_opps
+    total: int  # every match seen, including excluded tickers
+    complete: bool  # False if the scan stopped before the last page
+
+
+@functools.lru_cache(maxsize=4096)
+def _close_ts(close_time: str) -> float | None:
+    """Parse an ISO-8601 close time to epoch seconds, or None if unusable.
+
+    Cached because many markets share the same daily/weekly close time.
+    """
+    try:
+        ct = datetime.fromisoformat(close_time.replace("Z", "+00:00"))
+    except (ValueError, TypeError):
+        return None
+    if ct.tzinfo is None:
+        return None
+    return ct.timestamp()
+
+
+def _filter_page(
+    markets: list[dict[str, Any]], cutoff_ts: float
+) -> list[Opportunity]:
+    """Return the opportunities in one page of markets."""
+    opportunities: list[Opportunity] = []
+    # Bind hot names locally; this loop runs once per market
+    append = opportunities.append
+    opp = Opportunity
+    yes_low = config.YES_LOW_THRESHOLD
+    yes_high = config.YES_HIGH_THRESHOLD
+    close_ts = _close_ts
+    no_edge = _NO_EDGE
+    yes_edge = _YES_EDGE
+
+    for m in markets:
+        # Filter: must have close_time within expiry window
+        close_time = m.get("close_time")
+        if not close_time:
+            continue
+        ct = close_ts(close_time)
+        if ct is None or ct > cutoff_ts:
+            continue
+
+        yes_price = m.get("yes_bid") or 0
+        if type(yes_price) is not int:
+            # The edge tables are indexed by price; a malformed bid must not
+            # abort the whole page
             try:
-                ct = datetime.fromisoformat(close_time.replace("Z", "+00:00"))
-            except (ValueError, TypeError):
-                continue
-            if ct > cutoff:
+                yes_price = int(yes_price)
+            except (TypeError, ValueError):
                 continue
 
-            yes_price = m.get("yes_bid", 0) or 0
-            no_price = m.get("no_bid", 0) or 0
-            ticker = m.get("ticker", "")
-            event_ticker = m.get("event_ticker", "")
-            title = m.get("title", "")
-
-            # Longshot: YES < 10c → sell YES (buy NO)
-            if 0 < yes_price < config.YES_LOW_THRESHOLD:
-                implied_win = (100 - yes_price) / 100.0
-                if implied_win >= 0.90:
-                    entry = 100 - yes_price  # NO price
-                    edge = implied_win - 0.5
-                    opportunities.append(Opportunity(
-                        ticker=ticker, event_ticker=event_ticker, title=title,
-                        yes_price=yes_price, no_price=no_price, side="no",
-                        entry_price=entry, edge=round(edge, 4),
-                        close_time=close_time,
-                    ))
-
-            # Favorite: YES > 85c → buy YES
-            if yes_price > config.YES_HIGH_THRESHOLD:
-                implied_win = yes_price / 100.0
-                if implied_win >= 0.90:
-                    edge = implied_win - 0.5
-                    opportunities.append(Opportunity(
-                        ticker=ticker, event_ticker=event_ticker, title=title,
-                        yes_price=yes_price, no_price=no_price, side="yes",
-                        entry_price=yes_price, edge=round(edge, 4),
-                        close_time=close_time,
-                    ))
-
-        cursor = data.get("cursor")
-        if not cursor or not markets:
-            break
+        # Longshot: YES < 10c → sell YES (buy NO)
+        if 0 < yes_price < yes_low:
+            edge = no_edge[yes_price]
+            if edge is not None:
+                append(opp(
+                    m.get("ticker", ""), m.get("event_ticker", ""),
+                    m.get("title", ""), yes_price, m.get("no_bid") or 0,
+                    "no", 100 - yes_price, edge, close_time,
+                ))
+
+        # Favorite: YES > 85c → buy YES; a 100c entry can't profit, and
+        # skipping it keeps _MAX_EDGE an upper bound on any kept edge
+        elif yes_high < yes_price < 100:
+            edge = yes_edge[yes_price]
+            if edge is not None:
+                append(opp(
+                    m.get("ticker", ""), m.get("event_ticker", ""),
+                    m.get("title", ""), yes_price, m.get("no_bid") or 0,
+                    "yes", yes_price, edge, close_time,
+                ))
 
-    # Sort by edge descending
-    opportunities.sort(key=lambda o: o.edge, reverse=True)
-    logger.info("Scan complete: %d opportunities found", len(opportunities))
     return opportunities
+
+
+async def iter_opportunities(
+    client: KalshiClient,
+    should_continue: Callable[[], bool] | None = None,
+) -> AsyncIterator[Opportunity]:
+    """Yield opportunities page by page as open markets are fetched.
+
+    *should_continue* is polled after each page; returning False ends the
+    scan without fetching further pages.
+    """
+    cutoff = datetime.now(timezone.utc) + timedelta(days=config.MAX_EXPIRY_DAYS)
+    cutoff_ts = cutoff.timestamp()
+
+    next_page: asyncio.Task | None = asyncio.create_task(
+        client.get_markets(limit=1000, status="open")
+    )
+    try:
+        while next_page is not None:
+            data = await next_page
+            markets = data.get("markets", [])
+            cursor = data.get("cursor")
+
+            # Prefetch page N+1 while page N is filtered off the event loop
+            next_page = None
+            if cursor and markets:
+                next_page = asyncio.create_task(
+                    client.get_markets(cursor=cursor, limit=1000, status="open")
+                )
+
+            for opp in await asyncio.to_thread(_filter_page, markets, cutoff_ts):
+                yield opp
+
+            if should_continue is not None and not should_continue():
+                logger.info("Scan interrupted by caller")
+                break
+    finally:
+        if next_page is not None:
+            if next_page.done():
+                # Retrieve a failed prefetch's error so asyncio doesn't log it
+                if not next_page.cancelled():
+                    next_page.exception()
+            else:
+                next_page.cancel()
+
+
+async def scan_markets(
+    client: KalshiClient,
+    max_opps: int = 256,
+    should_continue: Callable[[], bool] | None = None,
+    exclude: frozenset[str] = frozenset(),
+) -> ScanResult:
+    """Fetch open markets and return the *max_opps* best opportunities.
+
+    Tickers in *exclude* (markets already held) are counted in the total
+    but never kept, so they cannot crowd out tradable opportunities.
+    Scanning stops early once every kept opportunity already has the
+    best edge any market can offer, since later markets cannot beat it.
+    """
+    # Min-heap of (edge, -seq, opp): seq keeps ties in discovery order
+    heap: list[tuple[float, int, Opportunity]] = []
+    seq = 0
+    total = 0
+    complete = True
+
+    stream = iter_opportunities(client, should_continue)
+    try:
+        async for opp in stream:
+            total += 1
+            if opp.ticker in exclude:
+                continue
+            seq += 1
+            item = (opp.edge, -seq, opp)
+            if len(heap) < max_opps:
+                heapq.heappush(heap, item)
+            elif item > heap[0]:
+                heapq.heapreplace(heap, item)
+
+            if len(heap) >= max_opps and heap[0][0] >= _MAX_EDGE:
+                logger.info("Top %d opportunities saturated; stopping scan", max_opps)
+                complete = False
+                break
+    finally:
+        await stream.aclose()
+    if should_continue is not None and not should_continue():
+        complete = False
+
+    # Sort by edge descending
+    opportunities = [opp for _, _, opp in sorted(heap, reverse=True)]
+    logger.info("Scan complete: %d opportunities found", total)
+    return ScanResult(opportunities, total, complete)
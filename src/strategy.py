@@ -23,7 +23,7 @@ class TradeSignal:
 
     def to_dict(self) -> dict[str, Any]:
         return {
-            **self.opportunity.to_dict(),
+            **self.opportunity._asdict(),
             "quantity": self.quantity,
             "reason": self.reason,
         }
@@ -32,7 +32,7 @@ class TradeSignal:
 def score_opportunities(
     opportunities: list[Opportunity],
     balance: int,
-    open_tickers: set[str],
+    open_tickers: frozenset[str],
 ) -> list[TradeSignal]:
     """Filter and size opportunities given current portfolio state.
 
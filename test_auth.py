@@ -2,6 +2,7 @@
 
 import asyncio
 import base64
+import sys
 import time
 from urllib.parse import urlparse
 
@@ -11,6 +12,12 @@ from cryptography.hazmat.primitives.asymmetric import padding, rsa
 
 import config
 
+_PSS = padding.PSS(
+    mgf=padding.MGF1(hashes.SHA256()),
+    salt_length=padding.PSS.DIGEST_LENGTH,
+)
+_SHA256 = hashes.SHA256()
+
 
 def load_key():
     with open(config.KALSHI_PRIVATE_KEY_PATH, "rb") as f:
@@ -28,14 +35,7 @@ def load_key():
 def sign(private_key, timestamp_str, method, path):
     msg = timestamp_str + method + path
     print(f"Signing message: {msg!r}")
-    signature = private_key.sign(
-        msg.encode("utf-8"),
-        padding.PSS(
-            mgf=padding.MGF1(hashes.SHA256()),
-            salt_length=padding.PSS.DIGEST_LENGTH,
-        ),
-        hashes.SHA256(),
-    )
+    signature = private_key.sign(msg.encode("utf-8"), _PSS, _SHA256)
     return base64.b64encode(signature).decode("utf-8")
 
 
@@ -68,4 +68,9 @@ async def test():
         print(f"Body: {r.text[:500]}")
 
 
-asyncio.run(test())
+if sys.platform == "win32":
+    asyncio.run(test())
+else:
+    import uvloop
+
+    uvloop.run(test())